@@ -34,40 +34,246 @@ Notes
   logs the offer/answer but leaves the media exchange to unifi-cam-proxy.
 * Stream URLs expire. The script renews them ahead of expiry using the provided
   extension token or by requesting a new stream and restarting the proxy.
-* Event polling is best-effort; robust production usage should integrate with
-  Google Pub/Sub for real-time events.
+* Doorbell/motion events are delivered through a Google Pub/Sub subscription
+  when ``--pubsub-subscription`` is given (requires ``google-cloud-pubsub``).
+  ``--poll-events`` remains as a best-effort polling fallback.
 """
 from __future__ import annotations
 
 import argparse
 import json
 import logging
+import logging.handlers
+import os
+import queue
+import re
+import select
+import shutil
+import signal
+import ssl
 import subprocess
 import threading
 import time
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import IO, Any, Deque, Dict, Optional, Sequence, Tuple, Union
 
+import certifi
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import ciso8601
+except ImportError:  # Optional; falls back to datetime.fromisoformat.
+    ciso8601 = None
+
+try:
+    import orjson
+except ImportError:  # Optional; falls back to the stdlib json module.
+    orjson = None
+
+try:
+    import httpx
+except ImportError:  # Optional; only needed for --http2.
+    httpx = None
 
 SDM_BASE_URL = "https://smartdevicemanagement.googleapis.com/v1"
+USER_AGENT = "nest-to-unifi-bridge"
+GENERATE_RTSP_COMMAND = "sdm.devices.commands.CameraLiveStream.GenerateRtspStream"
+EXTEND_RTSP_COMMAND = "sdm.devices.commands.CameraLiveStream.ExtendRtspStream"
+GENERATE_WEBRTC_COMMAND = "sdm.devices.commands.CameraLiveStream.GenerateWebRtcStream"
+JSON_HEADERS = {"Content-Type": "application/json"}
+# (connect, read) seconds for an event poll; kept short so a poll cannot delay stream renewals.
+EVENT_POLL_TIMEOUT = (3.05, 10.0)
+PROXY_OUTPUT_BACKLOG = 1000
+PROXY_OUTPUT_MAX_LINE = 64 * 1024
+# ffmpeg redraws progress with bare "\r", so carriage returns end a line too.
+PROXY_LINE_BREAK = re.compile(rb"\r\n?|\n")
+PROXY_RESTART_BACKOFF = 5.0
 LOG = logging.getLogger("nest_to_unifi_bridge")
+PROXY_LOG = logging.getLogger("nest_to_unifi_bridge.proxy")
+
+# Both raise ValueError subclasses on malformed input, which callers catch alongside TRANSPORT_ERRORS.
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Errors raised by whichever HTTP client the bridge runs with (requests, or httpx for --http2).
+HTTP_STATUS_ERRORS: Tuple[type, ...] = (requests.HTTPError,)
+TRANSPORT_ERRORS: Tuple[type, ...] = (requests.RequestException,)
+if httpx is not None:
+    HTTP_STATUS_ERRORS += (httpx.HTTPStatusError,)
+    TRANSPORT_ERRORS += (httpx.HTTPError,)
 
 
 def _parse_timestamp(ts: str) -> datetime:
     """Parse RFC3339 timestamps and normalize to UTC."""
+    if ciso8601 is not None:
+        return ciso8601.parse_rfc3339(ts).astimezone(timezone.utc)
     if ts.endswith("Z"):
         ts = ts.replace("Z", "+00:00")
     return datetime.fromisoformat(ts).astimezone(timezone.utc)
 
 
+class ShutdownSignals:
+    """SIGINT/SIGTERM handling for the supervisor thread.
+
+    The handler only sets a flag. While the supervisor is parked in ``wait_until`` the
+    ``signal.set_wakeup_fd`` pipe wakes its select(); anywhere else the handler raises
+    KeyboardInterrupt so blocking work (HTTP requests, backoff sleeps) is abandoned too.
+    No lock is taken in the handler, so it cannot deadlock against the interrupted code.
+    """
+
+    def __init__(self) -> None:
+        self.signum: Optional[int] = None
+        self._waiting = False
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_r, False)
+        os.set_blocking(self._wakeup_w, False)
+
+    @property
+    def requested(self) -> bool:
+        return self.signum is not None
+
+    def install(self) -> None:
+        signal.set_wakeup_fd(self._wakeup_w)
+        signal.signal(signal.SIGINT, self._handle)
+        signal.signal(signal.SIGTERM, self._handle)
+
+    def uninstall(self) -> None:
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.set_wakeup_fd(-1)
+        os.close(self._wakeup_r)
+        os.close(self._wakeup_w)
+
+    def _handle(self, signum: int, _frame: Any) -> None:
+        self.signum = signum
+        if not self._waiting:
+            raise KeyboardInterrupt
+
+    def wait_until(self, deadline: float, fds: Sequence[int] = ()) -> bool:
+        """Wait until a ``time.monotonic()`` deadline, a signal, or a readable fd.
+
+        Returns True once shutdown has been requested.
+        """
+        if self.requested:
+            return True
+        self._waiting = True
+        try:
+            select.select([self._wakeup_r, *fds], [], [], max(0.0, deadline - time.monotonic()))
+        finally:
+            self._waiting = False
+        try:
+            os.read(self._wakeup_r, 512)
+        except BlockingIOError:
+            pass
+        return self.requested
+
+
+def _command_body(command: str, params: Optional[Dict[str, Any]] = None) -> bytes:
+    return json.dumps({"command": command, "params": params or {}}).encode()
+
+
+def build_ssl_context() -> ssl.SSLContext:
+    """Load the CA bundle once into a context that every pooled connection reuses."""
+    # Same override order requests applies per request, resolved once here instead.
+    bundle = os.environ.get("REQUESTS_CA_BUNDLE") or os.environ.get("CURL_CA_BUNDLE") or certifi.where()
+    if os.path.isdir(bundle):
+        context = ssl.create_default_context(capath=bundle)
+    else:
+        context = ssl.create_default_context(cafile=bundle)
+    # Keep TLS session tickets enabled so the server can offer resumption on reconnects.
+    context.options &= ~ssl.OP_NO_TICKET
+    return context
+
+
+class TLSContextAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools (direct and proxied) all use one prebuilt SSLContext."""
+
+    def __init__(self, ssl_context: ssl.SSLContext, **kwargs: Any) -> None:
+        # Set before HTTPAdapter.__init__, which builds the pool manager.
+        self.ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        kwargs["ssl_context"] = self.ssl_context
+        super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, proxy: str, **proxy_kwargs: Any) -> Any:
+        proxy_kwargs["ssl_context"] = self.ssl_context
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+    def cert_verify(self, conn: Any, url: str, verify: Any, cert: Any) -> None:
+        super().cert_verify(conn, url, verify, cert)
+        if verify:
+            # Trust already lives in self.ssl_context. requests turns verify=True
+            # into a bundle path (certifi or REQUESTS_CA_BUNDLE), and urllib3
+            # would re-run load_verify_locations on that context per connection.
+            conn.ca_certs = None
+            conn.ca_cert_dir = None
+
+
+def build_session(ssl_context: Optional[ssl.SSLContext] = None) -> requests.Session:
+    """Create a keep-alive session with a small, retrying connection pool.
+
+    Every call goes to the same SDM host, so a few pooled connections are
+    enough and reusing them avoids a TLS handshake on each renewal or poll.
+    """
+    retry = Retry(
+        total=3,
+        # Never resend after a read timeout: the server may already have applied the command
+        # (e.g. consumed an extension token), and retries block the supervisor thread.
+        read=0,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        # GET is only the best-effort event poll, which runs on the supervisor thread; it gets
+        # no status retries or Retry-After sleeps so it cannot hold up a renewal.
+        allowed_methods=frozenset(["POST"]),
+        # Hand the final response back so raise_for_status() still surfaces HTTPError.
+        raise_on_status=False,
+    )
+    adapter = TLSContextAdapter(
+        ssl_context or build_ssl_context(),
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.headers.update({"Connection": "keep-alive", "User-Agent": USER_AGENT})
+    return session
+
+
+def build_http2_client(ssl_context: Optional[ssl.SSLContext] = None) -> httpx.Client:
+    """Create an HTTP/2 client that multiplexes all SDM calls over one TLS connection.
+
+    Unlike build_session(), only failed connection attempts are retried; httpx has no
+    retry/backoff for 429 or 5xx responses, so those surface on the first attempt.
+    """
+    if httpx is None:
+        raise ImportError("httpx is not installed")
+    transport = httpx.HTTPTransport(
+        http2=True,
+        verify=ssl_context or build_ssl_context(),
+        limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=75),
+        retries=3,
+    )
+    return httpx.Client(transport=transport, timeout=30.0, headers={"User-Agent": USER_AGENT})
+
+
 @dataclass
 class StreamInfo:
     url: str
     expires_at: datetime
     extension_token: Optional[str] = None
     protocol: str = "rtsp"
+    expires_mono: float = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # Renewal checks compare against this monotonic deadline; expires_at is kept for logging.
+        ttl = (self.expires_at - datetime.now(timezone.utc)).total_seconds()
+        self.expires_mono = time.monotonic() + ttl
 
     @classmethod
     def from_rtsp_response(cls, data: Dict[str, Any]) -> "StreamInfo":
@@ -87,56 +293,83 @@ class StreamInfo:
 class NestStreamClient:
     """Handles Nest SDM API calls for live streaming and event polling."""
 
-    def __init__(self, access_token: str, device_name: str, session: Optional[requests.Session] = None):
+    def __init__(
+        self,
+        access_token: str,
+        device_name: str,
+        session: Optional[Union[requests.Session, httpx.Client]] = None,
+        renew_margin: int = 120,
+    ):
         self.access_token = access_token
         self.device_name = device_name
-        self.session = session or requests.Session()
-        self.session.headers.update({"Authorization": f"Bearer {self.access_token}"})
+        self.session = session or build_session()
+        # Sent per request rather than set on the (possibly shared) client's default headers.
+        self._auth_headers = {"Authorization": f"Bearer {self.access_token}"}
+        self._command_headers = {**JSON_HEADERS, **self._auth_headers}
         self.current_stream: Optional[StreamInfo] = None
+        self._renew_margin = renew_margin
+        self._last_event_update: Optional[str] = None
+        self._cmd_url = f"{SDM_BASE_URL}/{device_name}:executeCommand"
+        self._get_url = f"{SDM_BASE_URL}/{device_name}"
+        # Parameterless command bodies never change, so serialize them once.
+        self._rtsp_body = _command_body(GENERATE_RTSP_COMMAND)
+        self._webrtc_body = _command_body(GENERATE_WEBRTC_COMMAND)
+        # httpx takes raw request bytes as content=; requests takes them as data=.
+        if httpx is not None and isinstance(self.session, httpx.Client):
+            # httpx takes raw request bytes as content= and a Timeout object for split timeouts.
+            self._body_arg = "content"
+            self._poll_timeout: Any = httpx.Timeout(EVENT_POLL_TIMEOUT[1], connect=EVENT_POLL_TIMEOUT[0])
+        else:
+            self._body_arg = "data"
+            self._poll_timeout = EVENT_POLL_TIMEOUT
 
     def execute_command(self, command: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        url = f"{SDM_BASE_URL}/{self.device_name}:executeCommand"
-        payload = {"command": command, "params": params or {}}
+        return self._post_command(command, _command_body(command, params))
+
+    def _post_command(self, command: str, body: bytes) -> Dict[str, Any]:
         LOG.debug("Executing command %s", command)
-        response = self.session.post(url, json=payload, timeout=30)
+        response = self.session.post(self._cmd_url, headers=self._command_headers, timeout=30, **{self._body_arg: body})
         response.raise_for_status()
-        return response.json()
+        return _json_loads(response.content)
 
     def generate_rtsp_stream(self) -> StreamInfo:
-        data = self.execute_command("sdm.devices.commands.CameraLiveStream.GenerateRtspStream")
+        data = self._post_command(GENERATE_RTSP_COMMAND, self._rtsp_body)
         LOG.info("Generated RTSP stream")
         return StreamInfo.from_rtsp_response(data)
 
     def extend_rtsp_stream(self, extension_token: str) -> StreamInfo:
-        data = self.execute_command(
-            "sdm.devices.commands.CameraLiveStream.ExtendRtspStream",
-            {"streamExtensionToken": extension_token},
-        )
+        data = self.execute_command(EXTEND_RTSP_COMMAND, {"streamExtensionToken": extension_token})
         LOG.info("Extended RTSP stream")
         return StreamInfo.from_rtsp_response(data)
 
     def generate_webrtc_stream(self) -> StreamInfo:
         # WebRTC uses offer/answer; we request an offer and expect the caller to manage SDP.
-        data = self.execute_command("sdm.devices.commands.CameraLiveStream.GenerateWebRtcStream")
+        data = self._post_command(GENERATE_WEBRTC_COMMAND, self._webrtc_body)
         LOG.info("Generated WebRTC offer; pass the SDP to your proxy")
         return StreamInfo.from_webrtc_response(data)
 
     def request_stream(self) -> StreamInfo:
         try:
             stream = self.generate_rtsp_stream()
-        except requests.HTTPError as exc:
+        except HTTP_STATUS_ERRORS as exc:
             LOG.warning("RTSP command unavailable (%s). Falling back to WebRTC.", exc)
             stream = self.generate_webrtc_stream()
         self.current_stream = stream
         return stream
 
-    def ensure_stream_active(self, renew_margin: int = 120) -> StreamInfo:
-        if not self.current_stream:
-            return self.request_stream()
+    def _needs_renewal(self) -> bool:
+        stream = self.current_stream
+        return stream is None or stream.expires_mono - time.monotonic() <= self._renew_margin
 
-        now = datetime.now(timezone.utc)
-        if (self.current_stream.expires_at - now).total_seconds() > renew_margin:
+    def ensure_stream_active(self) -> StreamInfo:
+        # Steady state is a single comparison; everything else lives in _renew_slow().
+        if not self._needs_renewal():
             return self.current_stream
+        return self._renew_slow()
+
+    def _renew_slow(self) -> StreamInfo:
+        if not self.current_stream:
+            return self.request_stream()
 
         LOG.info("Stream close to expiry; renewing")
         try:
@@ -144,29 +377,62 @@ class NestStreamClient:
                 self.current_stream = self.extend_rtsp_stream(self.current_stream.extension_token)
             else:
                 self.current_stream = self.request_stream()
-        except requests.RequestException:
+        except (*TRANSPORT_ERRORS, ValueError):
             LOG.exception("Failed to renew stream; requesting a new one after backoff")
             time.sleep(5)
             self.current_stream = self.request_stream()
         return self.current_stream
 
-    def poll_events(self, interval: int, stop_event: threading.Event) -> None:
-        url = f"{SDM_BASE_URL}/{self.device_name}"
-        last_update: Optional[str] = None
-        while not stop_event.is_set():
-            try:
-                response = self.session.get(url, timeout=15)
-                response.raise_for_status()
-                payload = response.json()
-                update_time = payload.get("updateTime")
-                if update_time and update_time != last_update:
-                    last_update = update_time
-                    events = payload.get("events", {})
-                    for event_name, event_payload in events.items():
-                        LOG.info("Event from Nest: %s => %s", event_name, json.dumps(event_payload))
-            except requests.RequestException:
-                LOG.exception("Error while polling Nest events")
-            stop_event.wait(interval)
+    def poll_events_once(self) -> None:
+        """Fetch the device once and log any events newer than the last poll."""
+        try:
+            response = self.session.get(self._get_url, headers=self._auth_headers, timeout=self._poll_timeout)
+            response.raise_for_status()
+            payload = _json_loads(response.content)
+            update_time = payload.get("updateTime")
+            if update_time and update_time != self._last_event_update:
+                self._last_event_update = update_time
+                if LOG.isEnabledFor(logging.INFO):
+                    for event_name, event_payload in payload.get("events", {}).items():
+                        LOG.info("Event from Nest: %s => %r", event_name, event_payload)
+        except (*TRANSPORT_ERRORS, ValueError):
+            LOG.exception("Error while polling Nest events")
+
+    def subscribe_events(self, subscription: str) -> Tuple[Any, Any]:
+        """Stream device events from a Pub/Sub subscription (``projects/.../subscriptions/...``).
+
+        Returns the subscriber client and the streaming-pull future; cancel the
+        future and close the client to stop receiving events.
+        """
+        from google.cloud import pubsub_v1
+
+        subscriber = pubsub_v1.SubscriberClient()
+        future = subscriber.subscribe(subscription, callback=self._on_nest_event)
+        LOG.info("Listening for Nest events on %s", subscription)
+        return subscriber, future
+
+    def _on_nest_event(self, message: Any) -> None:
+        try:
+            payload = _json_loads(message.data)
+        except ValueError:
+            LOG.warning("Discarding malformed Pub/Sub message %s", message.message_id)
+            message.ack()
+            return
+        update = payload.get("resourceUpdate", {})
+        if update.get("name") == self.device_name and LOG.isEnabledFor(logging.INFO):
+            for event_name, event_payload in update.get("events", {}).items():
+                LOG.info("Event from Nest: %s => %r", event_name, event_payload)
+        message.ack()
+
+
+class _LazyJoin:
+    """Log argument that only joins the command line if the record is emitted."""
+
+    def __init__(self, parts: list[str]) -> None:
+        self.parts = parts
+
+    def __str__(self) -> str:
+        return " ".join(self.parts)
 
 
 class ProtectCameraProxy:
@@ -194,6 +460,9 @@ class ProtectCameraProxy:
         self.rtsp_password = rtsp_password
         self.insecure = insecure
         self.process: Optional[subprocess.Popen] = None
+        # Readable once the proxy exits (Linux only); None where pidfds are unavailable.
+        self.pidfd: Optional[int] = None
+        self.started_at = 0.0
         self.current_stream_url: Optional[str] = None
 
     def _build_command(self, stream_url: str, protocol: str) -> list[str]:
@@ -209,21 +478,91 @@ class ProtectCameraProxy:
         return cmd
 
     def start(self, stream_url: str, protocol: str = "rtsp") -> None:
-        if self.process and self.process.poll() is None:
+        if self.is_running():
             LOG.info("Stopping existing proxy before restart")
-            self.stop()
+        self.stop()
         if protocol != "rtsp":
             LOG.warning(
                 "Starting proxy with %s. Ensure your unifi-cam-proxy build supports this mode.",
                 protocol,
             )
         cmd = self._build_command(stream_url, protocol)
-        LOG.info("Starting unifi-cam-proxy: %s", " ".join(cmd))
-        self.process = subprocess.Popen(cmd)
+        LOG.info("Starting unifi-cam-proxy: %s", _LazyJoin(cmd))
+        self.process = self._spawn(cmd)
+        self.started_at = time.monotonic()
+        os.set_blocking(self.process.stdout.fileno(), False)
+        threading.Thread(
+            target=self._forward_output, args=(self.process.stdout,), name="unifi-cam-proxy-output", daemon=True
+        ).start()
+        if hasattr(os, "pidfd_open"):
+            try:
+                self.pidfd = os.pidfd_open(self.process.pid)
+            except OSError:
+                LOG.debug("pidfd_open unavailable; proxy exits are detected by polling")
         self.current_stream_url = stream_url
 
+    def is_running(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    @staticmethod
+    def _spawn(cmd: list[str]) -> subprocess.Popen:
+        """Launch the proxy, letting CPython use posix_spawn rather than fork+exec.
+
+        Popen only takes its posix_spawn path for an executable given by path and
+        close_fds=False. Descriptors the bridge opens are non-inheritable (PEP 446),
+        so nothing extra leaks into the child.
+        """
+        # Capture the proxy's output so a slow terminal or log sink never blocks its media pipeline.
+        output = {"stdout": subprocess.PIPE, "stderr": subprocess.STDOUT, "bufsize": 0}
+        executable = shutil.which(cmd[0])
+        if executable is None or not os.path.isabs(executable):
+            return subprocess.Popen(cmd, **output)
+        return subprocess.Popen(cmd, executable=executable, close_fds=False, **output)
+
+    @staticmethod
+    def _forward_output(stream: IO[bytes]) -> None:
+        """Relay proxy output to the log until EOF.
+
+        Output is read in bursts (everything available at once) and logged after each
+        burst. A burst of more than PROXY_OUTPUT_BACKLOG lines keeps only the newest ones,
+        and an unterminated line is flushed once it reaches PROXY_OUTPUT_MAX_LINE bytes.
+        """
+        fd = stream.fileno()
+        lines: Deque[bytes] = deque(maxlen=PROXY_OUTPUT_BACKLOG)
+        partial = b""
+        eof = False
+        try:
+            while not eof:
+                select.select([fd], [], [])
+                dropped = 0
+                # Drain everything available so a burst is logged as one batch.
+                while True:
+                    try:
+                        chunk = os.read(fd, 65536)
+                    except BlockingIOError:
+                        break
+                    if not chunk:
+                        eof = True
+                        break
+                    *complete, partial = PROXY_LINE_BREAK.split(partial + chunk)
+                    if len(partial) >= PROXY_OUTPUT_MAX_LINE:
+                        complete.append(partial)
+                        partial = b""
+                    dropped += max(0, len(lines) + len(complete) - PROXY_OUTPUT_BACKLOG)
+                    lines.extend(complete)
+                if eof and partial:
+                    lines.append(partial)
+                if dropped:
+                    PROXY_LOG.warning("Dropped %d lines from an oversized unifi-cam-proxy output burst", dropped)
+                while lines:
+                    line = lines.popleft().decode(errors="replace").rstrip()
+                    if line:
+                        PROXY_LOG.info("%s", line)
+        finally:
+            stream.close()
+
     def stop(self) -> None:
-        if self.process and self.process.poll() is None:
+        if self.is_running():
             LOG.info("Terminating unifi-cam-proxy")
             self.process.terminate()
             try:
@@ -231,6 +570,9 @@ class ProtectCameraProxy:
             except subprocess.TimeoutExpired:
                 LOG.warning("Force killing unifi-cam-proxy")
                 self.process.kill()
+        if self.pidfd is not None:
+            os.close(self.pidfd)
+            self.pidfd = None
         self.process = None
         self.current_stream_url = None
 
@@ -249,62 +591,160 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--rtsp-username", default="ubnt", help="RTSP username presented to Protect")
     parser.add_argument("--rtsp-password", default="ubnt", help="RTSP password presented to Protect")
     parser.add_argument("--renew-before", type=int, default=120, help="Seconds before expiry to renew")
-    parser.add_argument("--check-interval", type=int, default=60, help="Loop interval to check stream health")
-    parser.add_argument("--poll-events", action="store_true", help="Poll Nest for doorbell events")
+    parser.add_argument(
+        "--check-interval",
+        type=int,
+        default=60,
+        help="Maximum seconds between stream/proxy checks; proxy exits are detected immediately on Linux",
+    )
+    parser.add_argument(
+        "--pubsub-subscription",
+        help="Pub/Sub subscription (projects/.../subscriptions/...) to receive Nest events from",
+    )
+    parser.add_argument("--poll-events", action="store_true", help="Poll Nest for doorbell events (legacy fallback)")
     parser.add_argument("--event-interval", type=int, default=30, help="Polling interval for events")
+    parser.add_argument(
+        "--http2",
+        action="store_true",
+        help="Use HTTP/2 (httpx) for SDM API calls; requires httpx[http2]. Only connection "
+        "failures are retried on this path, not 429/5xx responses",
+    )
     parser.add_argument("--insecure", action="store_true", help="Allow insecure TLS to Protect")
     parser.add_argument("--log-level", default="INFO", help="Logging level")
     return parser.parse_args()
 
 
+class DeferredFormatQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves all message formatting to the listener thread.
+
+    The stock prepare() merges ``msg % args`` on the logging thread. That is skipped here,
+    which is safe because nothing the bridge passes as a log argument is mutated afterwards.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def configure_logging(level_name: str) -> logging.handlers.QueueListener:
+    """Route log records through a queue so a background thread does the stderr writes."""
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, level_name.upper(), logging.INFO))
+    root.addHandler(DeferredFormatQueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
 def main() -> None:
     args = parse_args()
-    logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.INFO))
+    listener = configure_logging(args.log_level)
+    try:
+        run(args)
+    finally:
+        # Flushes any queued records before the interpreter exits.
+        listener.stop()
 
-    device_name = f"enterprises/{args.project_id}/devices/{args.device_id}"
-    nest_client = NestStreamClient(args.nest_token, device_name)
-    proxy = ProtectCameraProxy(
-        host=args.protect_host,
-        username=args.protect_username,
-        password=args.protect_password,
-        adopt_token=args.protect_token,
-        camera_name=args.camera_name,
-        mac=args.camera_mac,
-        rtsp_username=args.rtsp_username,
-        rtsp_password=args.rtsp_password,
-        insecure=args.insecure,
-    )
 
-    stop_event = threading.Event()
-    event_thread: Optional[threading.Thread] = None
-    if args.poll_events:
-        event_thread = threading.Thread(
-            target=nest_client.poll_events, args=(args.event_interval, stop_event), daemon=True
+def run(args: argparse.Namespace) -> None:
+    device_name = f"enterprises/{args.project_id}/devices/{args.device_id}"
+    session: Union[requests.Session, httpx.Client]
+    if args.http2:
+        try:
+            session = build_http2_client()
+        except ImportError:
+            raise SystemExit('--http2 requires httpx with HTTP/2 support (pip install "httpx[http2]")')
+    else:
+        session = build_session()
+    # The SDM client is owned here so its pooled connections are released on every exit path.
+    # It is not shared with Protect: it pins the public CA bundle, which rejects Protect's
+    # self-signed certificate.
+    with session:
+        nest_client = NestStreamClient(
+            args.nest_token,
+            device_name,
+            session=session,
+            renew_margin=args.renew_before,
+        )
+        proxy = ProtectCameraProxy(
+            host=args.protect_host,
+            username=args.protect_username,
+            password=args.protect_password,
+            adopt_token=args.protect_token,
+            camera_name=args.camera_name,
+            mac=args.camera_mac,
+            rtsp_username=args.rtsp_username,
+            rtsp_password=args.rtsp_password,
+            insecure=args.insecure,
         )
-        event_thread.start()
+        supervise(args, nest_client, proxy)
+
+
+def supervise(args: argparse.Namespace, nest_client: NestStreamClient, proxy: ProtectCameraProxy) -> None:
+    subscriber: Any = None
+    pubsub_future: Any = None
+    if args.pubsub_subscription:
+        if args.poll_events:
+            LOG.warning("Ignoring --poll-events because --pubsub-subscription is set")
+            args.poll_events = False
+        try:
+            subscriber, pubsub_future = nest_client.subscribe_events(args.pubsub_subscription)
+        except ImportError:
+            raise SystemExit("--pubsub-subscription requires google-cloud-pubsub (pip install google-cloud-pubsub)")
 
+    shutdown = ShutdownSignals()
+    shutdown.install()
     try:
         stream = nest_client.request_stream()
         LOG.info("Using %s stream URL: %s (expires %s)", stream.protocol.upper(), stream.url, stream.expires_at)
-        proxy.start(stream.url, stream.protocol)
-
-        while not stop_event.is_set():
-            stream = nest_client.ensure_stream_active(renew_margin=args.renew_before)
-            LOG.debug("Stream expires at %s", stream.expires_at)
-            # If the URL changed (e.g., after regeneration), restart the proxy with the new URL.
-            if proxy.process is None or proxy.process.poll() is not None:
-                LOG.warning("Proxy stopped; restarting")
-                proxy.start(stream.url, stream.protocol)
-            elif stream.url != proxy.current_stream_url:
-                LOG.info("Stream URL changed; restarting proxy")
-                proxy.start(stream.url, stream.protocol)
-            stop_event.wait(args.check_interval)
+        if not shutdown.requested:
+            proxy.start(stream.url, stream.protocol)
+
+        # Stream supervision and event polling share this thread (and the client's
+        # connection pool); each runs when its own deadline comes due.
+        next_check = time.monotonic()
+        next_poll: Optional[float] = next_check if args.poll_events else None
+        while not shutdown.requested:
+            now = time.monotonic()
+            if now >= next_check:
+                stream = nest_client.ensure_stream_active()
+                LOG.debug("Stream expires at %s", stream.expires_at)
+                # If the URL changed (e.g., after regeneration), restart the proxy with the new URL.
+                if not proxy.is_running():
+                    LOG.warning("Proxy stopped; restarting")
+                    proxy.start(stream.url, stream.protocol)
+                elif stream.url != proxy.current_stream_url:
+                    LOG.info("Stream URL changed; restarting proxy")
+                    proxy.start(stream.url, stream.protocol)
+                if pubsub_future is not None and pubsub_future.done():
+                    LOG.error("Pub/Sub subscription stopped: %s", pubsub_future.exception())
+                    pubsub_future = None
+                # Wake right when the stream needs renewing. Proxy exits wake the loop through
+                # its pidfd; where that is unavailable, check_interval bounds how long a dead
+                # proxy can go unnoticed.
+                until_renewal = stream.expires_mono - now - args.renew_before
+                next_check = now + min(max(5.0, until_renewal), args.check_interval)
+            if next_poll is not None and now >= next_poll:
+                nest_client.poll_events_once()
+                next_poll = now + args.event_interval
+            deadline = next_check if next_poll is None else min(next_check, next_poll)
+            running = proxy.is_running()
+            if shutdown.wait_until(deadline, (proxy.pidfd,) if running and proxy.pidfd is not None else ()):
+                break
+            if running and not proxy.is_running():
+                # Restart a dead proxy right away, but not more often than the backoff allows.
+                next_check = min(next_check, max(time.monotonic(), proxy.started_at + PROXY_RESTART_BACKOFF))
+        LOG.info("Received %s, shutting down", signal.Signals(shutdown.signum).name)
     except KeyboardInterrupt:
         LOG.info("Interrupted, shutting down")
     finally:
-        stop_event.set()
-        if event_thread:
-            event_thread.join(timeout=5)
+        shutdown.uninstall()
+        if pubsub_future is not None:
+            pubsub_future.cancel()
+        if subscriber is not None:
+            subscriber.close()
         proxy.stop()
 
 